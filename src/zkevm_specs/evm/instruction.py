@@ -314,9 +314,12 @@ class Instruction:
         return cast_expr(self.select(lt, rhs, lhs), FQ)
 
     def rlc_to_fq(self, word: RLC, n_bytes: int) -> FQ:
-        if any(word.le_bytes[n_bytes:]):
+        assert n_bytes <= MAX_N_BYTES, "Too many bytes to composite an integer in field"
+        # Same as checking le_bytes[n_bytes:] are all zero and compositing
+        # le_bytes[:n_bytes], but without slicing and re-decoding the bytes.
+        if word.int_value >> (8 * n_bytes):
             raise ConstraintUnsatFailure(f"Word {word} has too many bytes to fit {n_bytes} bytes")
-        return self.bytes_to_fq(word.le_bytes[:n_bytes])
+        return FQ(word.int_value)
 
     def word_is_zero(self, word: RLC) -> FQ:
         assert len(word.le_bytes) == 32, "Expected word to contain 32 bytes"
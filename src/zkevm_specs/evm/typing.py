@@ -1,7 +1,7 @@
 from __future__ import annotations
-from typing import Dict, Iterator, List, NewType, Optional, Sequence, Union
-from functools import reduce
-from itertools import chain
+from typing import Any, Callable, Dict, Iterator, List, NewType, Optional, Sequence, Tuple, Union
+from itertools import chain, repeat
+from operator import attrgetter
 
 from ..util import (
     U64,
@@ -32,7 +32,38 @@ from .table import (
 from .opcode import get_push_size, Opcode
 
 
-class Block:
+class _FieldsCache:
+    """
+    Base class caching values derived from the public fields returned by
+    _fields. The cache is dropped once any of those fields is reassigned.
+    """
+
+    __slots__ = ("_fields_snapshot", "_cache")
+
+    _fields: Callable[[Any], Tuple[Any, ...]]
+    _fields_snapshot: Optional[Tuple[Any, ...]]
+    _cache: Dict[Any, Any]
+
+    def _fields_cache(self) -> Dict[Any, Any]:
+        fields = self._fields(self)
+        # Cheap when nothing changed, since the tuples then hold the same objects
+        if self._fields_snapshot != fields:
+            self._fields_snapshot = fields
+            self._cache = dict()
+        return self._cache
+
+
+class Block(_FieldsCache):
+    __slots__ = (
+        "coinbase",
+        "gas_limit",
+        "number",
+        "timestamp",
+        "difficulty",
+        "base_fee",
+        "history_hashes",
+    )
+
     coinbase: U160
 
     # Gas needs a lot arithmetic operation or comparison in EVM circuit, so we
@@ -53,6 +84,16 @@ class Block:
     # one is at history_hashes[-1].
     history_hashes: Sequence[U256]
 
+    _fields = attrgetter(
+        "coinbase",
+        "gas_limit",
+        "number",
+        "timestamp",
+        "difficulty",
+        "base_fee",
+        "history_hashes",
+    )
+
     def __init__(
         self,
         coinbase: U160 = U160(0x10),
@@ -61,20 +102,30 @@ class Block:
         timestamp: U64 = U64(0),
         difficulty: U256 = U256(0),
         base_fee: U256 = U256(int(1e9)),
-        history_hashes: Sequence[U256] = [],
+        history_hashes: Sequence[U256] = (),
     ) -> None:
         assert len(history_hashes) <= min(256, number)
 
+        self._fields_snapshot = None
         self.coinbase = coinbase
         self.gas_limit = gas_limit
         self.number = number
         self.timestamp = timestamp
         self.difficulty = difficulty
         self.base_fee = base_fee
-        self.history_hashes = history_hashes
+        # Copied so later changes of the caller's sequence don't leak into the
+        # cached table assignments
+        self.history_hashes = tuple(history_hashes)
 
     def table_assignments(self, randomness: FQ) -> List[BlockTableRow]:
-        return [
+        cache = self._fields_cache()
+        rows = cache.get(("table_assignments", randomness))
+        if rows is None:
+            rows = cache[("table_assignments", randomness)] = self._table_assignments(randomness)
+        return list(rows)
+
+    def _table_assignments(self, randomness: FQ) -> List[BlockTableRow]:
+        rows = [
             BlockTableRow(FQ(BlockContextFieldTag.Coinbase), FQ(0), FQ(self.coinbase)),
             BlockTableRow(FQ(BlockContextFieldTag.GasLimit), FQ(0), FQ(self.gas_limit)),
             BlockTableRow(FQ(BlockContextFieldTag.Number), FQ(0), FQ(self.number)),
@@ -83,17 +134,27 @@ class Block:
                 FQ(BlockContextFieldTag.Difficulty), FQ(0), RLC(self.difficulty, randomness)
             ),
             BlockTableRow(FQ(BlockContextFieldTag.BaseFee), FQ(0), RLC(self.base_fee, randomness)),
-        ] + [
-            BlockTableRow(
-                FQ(BlockContextFieldTag.HistoryHash),
-                FQ(self.number - idx - 1),
-                RLC(history_hash, randomness),
-            )
-            for idx, history_hash in enumerate(reversed(self.history_hashes))
         ]
+        tag = FQ(BlockContextFieldTag.HistoryHash)
+        rows.extend(
+            BlockTableRow(tag, FQ(self.number - idx - 1), RLC(history_hash, randomness))
+            for idx, history_hash in enumerate(reversed(self.history_hashes))
+        )
+        return rows
+
 
+class Transaction(_FieldsCache):
+    __slots__ = (
+        "id",
+        "nonce",
+        "gas",
+        "gas_price",
+        "caller_address",
+        "callee_address",
+        "value",
+        "call_data",
+    )
 
-class Transaction:
     id: int
     nonce: U64
     gas: U64
@@ -103,6 +164,17 @@ class Transaction:
     value: U256
     call_data: bytes
 
+    _fields = attrgetter(
+        "id",
+        "nonce",
+        "gas",
+        "gas_price",
+        "caller_address",
+        "callee_address",
+        "value",
+        "call_data",
+    )
+
     def __init__(
         self,
         id: int = 1,
@@ -114,6 +186,7 @@ class Transaction:
         value: U256 = U256(0),
         call_data: bytes = bytes(),
     ) -> None:
+        self._fields_snapshot = None
         self.id = id
         self.nonce = nonce
         self.gas = gas
@@ -124,166 +197,245 @@ class Transaction:
         self.call_data = call_data
 
     def call_data_gas_cost(self) -> int:
-        return reduce(
-            lambda acc, byte: (
-                acc
-                + (
-                    GAS_COST_TX_CALL_DATA_PER_ZERO_BYTE
-                    if byte == 0
-                    else GAS_COST_TX_CALL_DATA_PER_NON_ZERO_BYTE
-                )
-            ),
-            self.call_data,
-            0,
-        )
+        cache = self._fields_cache()
+        gas_cost = cache.get(("call_data_gas_cost",))
+        if gas_cost is None:
+            n_zero_bytes = self.call_data.count(0)
+            n_non_zero_bytes = len(self.call_data) - n_zero_bytes
+            gas_cost = cache[("call_data_gas_cost",)] = (
+                n_zero_bytes * GAS_COST_TX_CALL_DATA_PER_ZERO_BYTE
+                + n_non_zero_bytes * GAS_COST_TX_CALL_DATA_PER_NON_ZERO_BYTE
+            )
+        return gas_cost
 
     def table_assignments(self, randomness: FQ) -> Iterator[TxTableRow]:
-        return chain(
-            [
-                TxTableRow(FQ(self.id), FQ(TxContextFieldTag.Nonce), FQ(0), FQ(self.nonce)),
-                TxTableRow(FQ(self.id), FQ(TxContextFieldTag.Gas), FQ(0), FQ(self.gas)),
-                TxTableRow(
-                    FQ(self.id),
-                    FQ(TxContextFieldTag.GasPrice),
-                    FQ(0),
-                    RLC(self.gas_price, randomness),
-                ),
-                TxTableRow(
-                    FQ(self.id), FQ(TxContextFieldTag.CallerAddress), FQ(0), FQ(self.caller_address)
-                ),
-                TxTableRow(
-                    FQ(self.id),
-                    FQ(TxContextFieldTag.CalleeAddress),
-                    FQ(0),
-                    FQ(0 if self.callee_address is None else self.callee_address),
-                ),
-                TxTableRow(
-                    FQ(self.id),
-                    FQ(TxContextFieldTag.IsCreate),
-                    FQ(0),
-                    FQ(self.callee_address is None),
-                ),
-                TxTableRow(
-                    FQ(self.id), FQ(TxContextFieldTag.Value), FQ(0), RLC(self.value, randomness)
-                ),
-                TxTableRow(
-                    FQ(self.id),
-                    FQ(TxContextFieldTag.CallDataLength),
-                    FQ(0),
-                    FQ(len(self.call_data)),
-                ),
-                TxTableRow(
-                    FQ(self.id),
-                    FQ(TxContextFieldTag.CallDataGasCost),
-                    FQ(0),
-                    FQ(self.call_data_gas_cost()),
-                ),
-            ],
-            map(
-                lambda item: TxTableRow(
-                    FQ(self.id), FQ(TxContextFieldTag.CallData), FQ(item[0]), FQ(item[1])
-                ),
-                enumerate(self.call_data),
+        cache = self._fields_cache()
+        rows = cache.get(("table_assignments", randomness))
+        if rows is None:
+            rows = cache[("table_assignments", randomness)] = self._table_assignments(randomness)
+        return iter(rows)
+
+    def _table_assignments(self, randomness: FQ) -> List[TxTableRow]:
+        tx_id = FQ(self.id)
+        call_data = self.call_data
+        rows = [
+            TxTableRow(tx_id, FQ(TxContextFieldTag.Nonce), FQ(0), FQ(self.nonce)),
+            TxTableRow(tx_id, FQ(TxContextFieldTag.Gas), FQ(0), FQ(self.gas)),
+            TxTableRow(
+                tx_id,
+                FQ(TxContextFieldTag.GasPrice),
+                FQ(0),
+                RLC(self.gas_price, randomness),
+            ),
+            TxTableRow(tx_id, FQ(TxContextFieldTag.CallerAddress), FQ(0), FQ(self.caller_address)),
+            TxTableRow(
+                tx_id,
+                FQ(TxContextFieldTag.CalleeAddress),
+                FQ(0),
+                FQ(0 if self.callee_address is None else self.callee_address),
+            ),
+            TxTableRow(
+                tx_id,
+                FQ(TxContextFieldTag.IsCreate),
+                FQ(0),
+                FQ(self.callee_address is None),
             ),
+            TxTableRow(tx_id, FQ(TxContextFieldTag.Value), FQ(0), RLC(self.value, randomness)),
+            TxTableRow(
+                tx_id,
+                FQ(TxContextFieldTag.CallDataLength),
+                FQ(0),
+                FQ(len(call_data)),
+            ),
+            TxTableRow(
+                tx_id,
+                FQ(TxContextFieldTag.CallDataGasCost),
+                FQ(0),
+                FQ(self.call_data_gas_cost()),
+            ),
+        ]
+        # CallData rows are built column-wise in a single pass over call_data
+        rows.extend(
+            map(
+                TxTableRow,
+                repeat(tx_id),
+                repeat(FQ(TxContextFieldTag.CallData)),
+                map(FQ, range(len(call_data))),
+                map(FQ, call_data),
+            )
         )
+        return rows
 
 
-class Bytecode:
-    code: bytearray
+class InvalidOpcodeName(AttributeError, ValueError):
+    """
+    Raised when accessing a Bytecode method which is not named after an opcode.
+    It's an AttributeError so hasattr and getattr with default keep working.
+    """
 
-    def __init__(self, code: Optional[bytearray] = None) -> None:
-        self.code = bytearray() if code is None else code
+
+class Bytecode:
+    # Opcode methods resolved by __getattr__ are cached on the class, so
+    # instances don't need a __dict__.
+    __slots__ = ("_code", "_code_cache", "_hash_cache", "_is_code_cache")
+
+    # Only extended by push() and the opcode methods, which reset the caches
+    _code: bytearray
+    # Derived from _code lazily, and reset whenever _code is mutated
+    _code_cache: Optional[bytes]
+    _hash_cache: Optional[U256]
+    _is_code_cache: Optional[bytes]
+
+    def __init__(self, code: Optional[Union[bytes, bytearray]] = None) -> None:
+        self.code = bytes() if code is None else code
+
+    @property
+    def code(self) -> bytes:
+        """
+        Returns an immutable snapshot of the code shared by all read paths.
+        """
+        if self._code_cache is None:
+            self._code_cache = bytes(self._code)
+        return self._code_cache
+
+    @code.setter
+    def code(self, code: Union[bytes, bytearray]) -> None:
+        # Copied so later changes of the caller's buffer don't leak into the caches
+        self._code = bytearray(code)
+        self._invalidate_cache()
 
     def __getattr__(self, name: str):
-        def method(*args) -> Bytecode:
-            try:
-                opcode = Opcode[name.removesuffix("_").upper()]
-            except KeyError:
-                raise ValueError(f"Invalid opcode {name}")
-
-            if opcode.is_push():
-                assert len(args) == 1
-                self.push(args[0], opcode - Opcode.PUSH1 + 1)
-            elif opcode.is_dup() or opcode.is_swap():
-                assert len(args) == 0
-                self.code.append(opcode)
-            else:
-                assert len(args) <= 1024 - opcode.max_stack_pointer()
-                for arg in reversed(args):
-                    self.push(arg, 32)
-                self.code.append(opcode)
+        if name.startswith("__"):
+            raise AttributeError(name)
 
-            return self
+        opcode = _OPCODE_BY_NAME.get(name.removesuffix("_").lower())
+        if opcode is None:
+            raise InvalidOpcodeName(f"Invalid opcode {name}")
 
-        return method
+        # Install the method on the class so following accesses of the same
+        # name are resolved by normal attribute lookup without reaching here.
+        method = _opcode_method(opcode)
+        setattr(Bytecode, name, method)
+        return method.__get__(self)
 
     def push(self, value: Union[int, str, bytes, bytearray, RLC], n_bytes: int = 32) -> Bytecode:
-        if isinstance(value, int):
-            value = value.to_bytes(n_bytes, "big")
-        elif isinstance(value, str):
-            value = bytes.fromhex(value.lower().removeprefix("0x"))
-        elif isinstance(value, RLC):
-            value = bytes(reversed(value.le_bytes))
-        elif isinstance(value, bytes) or isinstance(value, bytearray):
-            ...
-        else:
-            raise NotImplementedError(f"Value of type {type(value)} is not yet supported")
+        encode = _PUSH_ENCODERS.get(type(value))
+        if encode is None:
+            # Fall back to isinstance for subclasses like IntEnum
+            encode = next(
+                (encode for ty, encode in _PUSH_ENCODERS.items() if isinstance(value, ty)), None
+            )
+            if encode is None:
+                raise NotImplementedError(f"Value of type {type(value)} is not yet supported")
+        value = encode(value, n_bytes)
 
         assert 0 < len(value) <= n_bytes, ValueError("Too many bytes as data portion of PUSH*")
 
         opcode = Opcode.PUSH1 + n_bytes - 1
-        self.code.append(opcode)
-        self.code.extend(value.rjust(n_bytes, b"\x00"))
+        self._code.append(opcode)
+        self._code.extend(value.rjust(n_bytes, _ZERO_BYTE))
+        self._invalidate_cache()
 
         return self
 
     def hash(self) -> U256:
-        return U256(int.from_bytes(keccak256(self.code), "big"))
+        if self._hash_cache is None:
+            self._hash_cache = U256(int.from_bytes(keccak256(self.code), "big"))
+        return self._hash_cache
+
+    def is_code(self) -> bytes:
+        """
+        Returns a mask with 1 at each index of code that is an opcode and 0 at
+        each index that is the data portion of a PUSH*.
+        """
+        if self._is_code_cache is None:
+            code = self.code
+            is_code = bytearray(len(code))
+            # Jump over the data portion of PUSH* instead of walking every byte
+            idx = 0
+            while idx < len(code):
+                is_code[idx] = 1
+                idx += _PUSH_SIZE[code[idx]] + 1
+            self._is_code_cache = bytes(is_code)
+        return self._is_code_cache
 
     def table_assignments(self, randomness: FQ) -> Iterator[BytecodeTableRow]:
-        class BytecodeIterator:
-            idx: int
-            push_data_left: int
-            hash: FQ
-            code: bytes
-
-            def __init__(self, hash: FQ, code: bytes):
-                self.idx = 0
-                self.push_data_left = 0
-                self.hash = hash
-                self.code = code
-
-            def __iter__(self):
-                return self
-
-            def __next__(self):
-                # return the length of the bytecode in the first row
-                if self.idx == 0:
-                    self.idx += 1
-                    return BytecodeTableRow(
-                        self.hash, FQ(BytecodeFieldTag.Length), FQ(0), FQ(0), FQ(len(self.code))
-                    )
-
-                if self.idx > len(self.code):
-                    raise StopIteration
-
-                # the other rows represent each byte in the bytecode
-                idx = self.idx - 1
-                byte = self.code[idx]
-                is_code = self.push_data_left == 0
-                self.push_data_left = get_push_size(byte) if is_code else self.push_data_left - 1
-                self.idx += 1
-                return BytecodeTableRow(
-                    self.hash, FQ(BytecodeFieldTag.Byte), FQ(idx), FQ(is_code), FQ(byte)
-                )
-
-        return BytecodeIterator(RLC(self.hash(), randomness).expr(), self.code)
+        hash = RLC(self.hash(), randomness).expr()
+        code = self.code
+
+        return chain(
+            # return the length of the bytecode in the first row
+            [BytecodeTableRow(hash, FQ(BytecodeFieldTag.Length), FQ(0), FQ(0), FQ(len(code)))],
+            # the other rows represent each byte in the bytecode, built column-wise
+            map(
+                BytecodeTableRow,
+                repeat(hash),
+                repeat(FQ(BytecodeFieldTag.Byte)),
+                map(FQ, range(len(code))),
+                map(FQ, self.is_code()),
+                map(FQ, code),
+            ),
+        )
+
+    def _invalidate_cache(self) -> None:
+        self._code_cache = None
+        self._hash_cache = None
+        self._is_code_cache = None
+
+
+_ZERO_BYTE = b"\x00"
+
+# Size of data portion of each byte when it's an opcode, 0 for non-PUSH*
+_PUSH_SIZE = bytes(get_push_size(byte) for byte in range(256))
+
+# Encoders of PUSH* data portion in big-endian, keyed by the type of value
+_PUSH_ENCODERS: Dict[type, Callable[[Any, int], bytes]] = {
+    int: lambda value, n_bytes: value.to_bytes(n_bytes, "big"),
+    str: lambda value, _: bytes.fromhex(value.lower().removeprefix("0x")),
+    RLC: lambda value, _: value.le_bytes[::-1],
+    bytes: lambda value, _: value,
+    bytearray: lambda value, _: value,
+}
+
+_OPCODE_BY_NAME: Dict[str, Opcode] = {opcode.name.lower(): opcode for opcode in Opcode}
+
+
+def _opcode_method(opcode: Opcode):
+    if opcode.is_push():
+        n_bytes = opcode - Opcode.PUSH1 + 1
+
+        def method(self: Bytecode, *args) -> Bytecode:
+            assert len(args) == 1
+            return self.push(args[0], n_bytes)
+
+    elif opcode.is_dup() or opcode.is_swap():
+
+        def method(self: Bytecode, *args) -> Bytecode:
+            assert len(args) == 0
+            self._code.append(opcode)
+            self._invalidate_cache()
+            return self
+
+    else:
+        max_n_args = 1024 - opcode.max_stack_pointer()
+
+        def method(self: Bytecode, *args) -> Bytecode:
+            assert len(args) <= max_n_args
+            for arg in reversed(args):
+                self.push(arg, 32)
+            self._code.append(opcode)
+            self._invalidate_cache()
+            return self
+
+    return method
 
 
 Storage = NewType("Storage", Dict[U256, U256])
 
 
 class Account:
+    __slots__ = ("address", "nonce", "balance", "code", "storage")
+
     address: U160
     nonce: U256
     balance: U256
@@ -0,0 +1,43 @@
+import pytest
+
+from zkevm_specs.evm import ExecutionState, StepState, Tables
+from zkevm_specs.evm.instruction import ConstraintUnsatFailure, Instruction
+from zkevm_specs.util import rand_fq, rand_range, FQ, RLC, MAX_N_BYTES
+
+TESTING_N_BYTES = (1, 5, 8, MAX_N_BYTES)
+
+
+def new_instruction() -> Instruction:
+    return Instruction(
+        randomness=rand_fq(),
+        tables=Tables(set(), set(), set(), set()),
+        curr=StepState(execution_state=ExecutionState.STOP, rw_counter=1),
+        next=None,
+        is_first_step=True,
+        is_last_step=True,
+    )
+
+
+@pytest.mark.parametrize("n_bytes", TESTING_N_BYTES)
+def test_rlc_to_fq(n_bytes: int):
+    instruction = new_instruction()
+
+    # Largest value which still fits in n_bytes
+    value = 2 ** (8 * n_bytes) - 1
+    assert instruction.rlc_to_fq(RLC(value), n_bytes) == FQ(value)
+
+    value = rand_range(2 ** (8 * n_bytes))
+    assert instruction.rlc_to_fq(RLC(value), n_bytes) == FQ(value)
+
+
+@pytest.mark.parametrize("n_bytes", TESTING_N_BYTES)
+def test_rlc_to_fq_too_many_bytes(n_bytes: int):
+    instruction = new_instruction()
+
+    # Smallest value which has a non-zero byte above n_bytes
+    with pytest.raises(ConstraintUnsatFailure):
+        instruction.rlc_to_fq(RLC(2 ** (8 * n_bytes)), n_bytes)
+
+    # Only the most significant byte of the word is non-zero
+    with pytest.raises(ConstraintUnsatFailure):
+        instruction.rlc_to_fq(RLC(1 << 248), n_bytes)
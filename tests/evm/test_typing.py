@@ -0,0 +1,141 @@
+from enum import IntEnum
+
+from zkevm_specs.evm import (
+    Block,
+    BlockContextFieldTag,
+    Bytecode,
+    Opcode,
+    Transaction,
+    TxContextFieldTag,
+    TxTableRow,
+    get_push_size,
+)
+from zkevm_specs.util import (
+    rand_bytes,
+    rand_fq,
+    FQ,
+    RLC,
+    GAS_COST_TX_CALL_DATA_PER_NON_ZERO_BYTE,
+    GAS_COST_TX_CALL_DATA_PER_ZERO_BYTE,
+    keccak256,
+)
+
+
+def test_transaction_table_assignments_after_field_change():
+    randomness = rand_fq()
+
+    tx = Transaction(id=1)
+    assert len(list(tx.table_assignments(randomness))) == 9
+
+    tx.call_data = bytes([1, 2])
+    rows = list(tx.table_assignments(randomness))
+    assert rows[-2:] == [
+        TxTableRow(FQ(1), FQ(TxContextFieldTag.CallData), FQ(0), FQ(1)),
+        TxTableRow(FQ(1), FQ(TxContextFieldTag.CallData), FQ(1), FQ(2)),
+    ]
+    assert TxTableRow(FQ(1), FQ(TxContextFieldTag.CallDataLength), FQ(0), FQ(2)) in rows
+
+    tx.nonce = 5
+    rows = list(tx.table_assignments(randomness))
+    assert TxTableRow(FQ(1), FQ(TxContextFieldTag.Nonce), FQ(0), FQ(5)) in rows
+
+
+def test_transaction_call_data_gas_cost_after_field_change():
+    tx = Transaction()
+    assert tx.call_data_gas_cost() == 0
+
+    tx.call_data = bytes([0, 1, 2])
+    assert tx.call_data_gas_cost() == (
+        GAS_COST_TX_CALL_DATA_PER_ZERO_BYTE + 2 * GAS_COST_TX_CALL_DATA_PER_NON_ZERO_BYTE
+    )
+
+
+def test_block_table_assignments_after_field_change():
+    randomness = rand_fq()
+
+    def base_fee(block: Block) -> int:
+        (row,) = [
+            row
+            for row in block.table_assignments(randomness)
+            if row.field_tag == FQ(BlockContextFieldTag.BaseFee)
+        ]
+        return row.value.int_value
+
+    block = Block()
+    assert base_fee(block) == int(1e9)
+
+    block.base_fee = 5
+    assert base_fee(block) == 5
+
+
+# Reference is_code computed byte by byte
+def is_code_per_byte(code: bytes) -> bytes:
+    is_code = []
+    push_data_left = 0
+    for byte in code:
+        is_code.append(push_data_left == 0)
+        push_data_left = get_push_size(byte) if is_code[-1] else push_data_left - 1
+    return bytes(is_code)
+
+
+def test_bytecode_is_code():
+    for _ in range(64):
+        code = rand_bytes(256)
+        assert Bytecode(bytearray(code)).is_code() == is_code_per_byte(code)
+
+
+def test_bytecode_is_code_truncated_push():
+    code = bytes([Opcode.ADD, Opcode.PUSH32, 0x01, 0x02])
+    assert Bytecode(bytearray(code)).is_code() == bytes([1, 1, 0, 0])
+    assert is_code_per_byte(code) == bytes([1, 1, 0, 0])
+
+
+def test_bytecode_caches_reset_on_mutation():
+    bytecode = Bytecode()
+    for mutate in [
+        lambda bytecode: bytecode.push(0xFF, 1),
+        lambda bytecode: bytecode.dup1(),
+        lambda bytecode: bytecode.swap1(),
+        lambda bytecode: bytecode.add(1, 2),
+    ]:
+        hash, code, is_code = bytecode.hash(), bytecode.code, bytecode.is_code()
+        mutate(bytecode)
+        assert bytecode.code != code
+        assert bytecode.hash() == int.from_bytes(keccak256(bytecode.code), "big") != hash
+        assert bytecode.is_code() == is_code_per_byte(bytecode.code) != is_code
+
+
+def test_bytecode_caches_reset_on_reassignment():
+    bytecode = Bytecode().stop()
+    hash = bytecode.hash()
+    bytecode.code = bytearray([Opcode.ADD])
+    assert bytecode.code == bytes([Opcode.ADD])
+    assert bytecode.hash() != hash
+
+
+def test_bytecode_code_copied_from_input():
+    code = bytearray([Opcode.STOP])
+    bytecode = Bytecode(code)
+    code.append(Opcode.ADD)
+    assert bytecode.code == bytes([Opcode.STOP])
+    # The exposed code is an immutable snapshot, so it can't go out of sync
+    assert isinstance(bytecode.code, bytes)
+
+
+def test_bytecode_push_value_types():
+    class Value(IntEnum):
+        A = 0x0102
+
+    expected = bytes([Opcode.PUSH2, 0x01, 0x02])
+    assert Bytecode().push(Value.A, 2).code == expected
+    assert Bytecode().push(bytearray([0x01, 0x02]), 2).code == expected
+    assert Bytecode().push(RLC(0x0102, n_bytes=2), 2).code == expected
+    assert Bytecode().push("0x0102", 2).code == expected
+    # Data shorter than n_bytes is left padded with zeros
+    assert Bytecode().push(bytes([0x02]), 2).code == bytes([Opcode.PUSH2, 0x00, 0x02])
+
+
+def test_bytecode_invalid_opcode_name():
+    bytecode = Bytecode()
+    assert not hasattr(bytecode, "foo")
+    assert getattr(bytecode, "foo", None) is None